@@ -0,0 +1,440 @@
+"""
+Scaling benchmarks for the algorithms in every question folder.
+
+Each benchmark has a seeded input generator and a list of growing sizes.
+For every size the function is timed (best and mean of --repeat runs) and
+its peak Python allocation is measured in a separate run with tracemalloc.
+Results are printed, written as JSON, and optionally compared against a
+stored baseline: a best time that grew by more than --threshold and
+--min-delta-ms, or a peak memory that grew by more than --mem-threshold and
+--min-delta-kib, is reported as a regression and the script exits with
+status 1.
+
+Examples:
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --out results.json
+    python benchmarks/run_benchmarks.py --only max_flow_edmonds_karp --quick
+"""
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load(relpath, name):
+    """Imports a question script (their file names are not valid module names)."""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, relpath))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+#  Generators: each takes (size, rng) and returns the call's arguments
+def gen_points(n, rng):
+    """n customer homes on a small integer grid, so many share lines."""
+    side = max(4, int(n ** 0.5))
+    return ([[rng.randrange(side), rng.randrange(side)] for _ in range(n)],)
+
+
+def gen_query(n, rng):
+    """Query of n dictionary words, with a few compounds to create alternatives."""
+    vocab = {"".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 7)))
+             for _ in range(1000)}
+    vocab = sorted(vocab)
+    words = [rng.choice(vocab) for _ in range(n)]
+    keywords = set(vocab)
+    for i in rng.sample(range(n - 1), min(5, n - 1)):
+        keywords.add(words[i] + words[i + 1])
+    return "".join(words), sorted(keywords)
+
+
+def gen_tree(n, rng, module):
+    """Random binary tree of n plants with outputs in [-50, 100]."""
+    nodes = [module.TreeNode(rng.randint(-50, 100))]
+    open_slots = [(nodes[0], "left"), (nodes[0], "right")]
+    for _ in range(n - 1):
+        parent, side = open_slots.pop(rng.randrange(len(open_slots)))
+        child = module.TreeNode(rng.randint(-50, 100))
+        setattr(parent, side, child)
+        open_slots += [(child, "left"), (child, "right")]
+    return (nodes[0],)
+
+
+def gen_prices(n, rng):
+    """Random-walk daily prices over n days, traded at most 10 times."""
+    prices, p = [], 3000
+    for _ in range(n):
+        p = max(100, p + rng.randint(-200, 200))
+        prices.append(p)
+    return 10, prices
+
+
+def gen_districts(n, rng):
+    """Demand for n districts over hours 0-23 (sets DISTRICTS/DEMAND in the caller)."""
+    districts = [f"D{i}" for i in range(n)]
+    demand = {h: {d: rng.randint(5, 40) for d in districts} for h in range(24)}
+    return districts, demand
+
+
+def gen_spots(n, rng):
+    """n tourist spots around Kathmandu with random fees and tags."""
+    tags = ["culture", "religious", "heritage", "nature", "relaxation", "adventure"]
+    return [{"name": f"Spot {i}", "lat": rng.uniform(27.60, 27.80),
+             "lon": rng.uniform(85.20, 85.45), "fee": rng.randint(0, 1000),
+             "tags": rng.sample(tags, 2)} for i in range(n)]
+
+
+#  Benchmarks
+def bench_points(q1a):
+    return lambda n, rng: (q1a.max_points_on_line, gen_points(n, rng))
+
+
+def bench_segmentation(q1b):
+    return lambda n, rng: (q1b.keyword_segmentation, gen_query(n, rng))
+
+
+def bench_generation(q2):
+    return lambda n, rng: (q2.max_generation_path, gen_tree(n, rng, q2))
+
+
+def bench_trading(q3):
+    return lambda n, rng: (q3.max_trading_profit, gen_prices(n, rng))
+
+
+def bench_allocate(q4):
+    def setup(n, rng):
+        q4.DISTRICTS, demand = gen_districts(n, rng)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                for hour in range(24):
+                    q4.allocate_hour(hour, demand[hour])
+        return run, ()
+    return setup
+
+
+def bench_simulation(q4):
+    def setup(n, rng):
+        q4.DISTRICTS, q4.DEMAND = gen_districts(n, rng)
+
+        def run():
+            with contextlib.redirect_stdout(io.StringIO()):
+                q4.run_simulation()
+        return run, ()
+    return setup
+
+
+def bench_itinerary(q5a):
+    def setup(n, rng):
+        q5a.SPOTS = gen_spots(n, rng)
+        return q5a.greedy_itinerary, (n * 500, n * 2.0, ["culture", "nature"])
+    return setup
+
+
+def bench_safest(q61):
+    def setup(n, rng):
+        return q61.compute_safest_routes, (q61.random_road_graph(n, seed=rng.randrange(1 << 30)), "J0")
+    return setup
+
+
+def bench_safest_csr(q61):
+    """Search only: compile_graph runs in setup and is not timed."""
+    def setup(n, rng):
+        csr = q61.compile_graph(q61.random_road_graph(n, seed=rng.randrange(1 << 30)))
+        return q61.compute_safest_routes_csr, (csr, "J0")
+    return setup
+
+
+def bench_compile_and_search_csr(q61):
+    """compile_graph + compute_safest_routes_csr, comparable to compute_safest_routes."""
+    def setup(n, rng):
+        graph = q61.random_road_graph(n, seed=rng.randrange(1 << 30))
+
+        def run():
+            q61.compute_safest_routes_csr(q61.compile_graph(graph), "J0")
+        return run, ()
+    return setup
+
+
+def gen_grid_pairs(n, rng, q61, queries=200):
+    """Compiled square grid road network of about n junctions, plus random query pairs."""
+    side = max(2, int(n ** 0.5))
+    csr = q61.compile_graph(q61.grid_road_graph(side, side, seed=rng.randrange(1 << 30)))
+    pairs = [(rng.choice(csr.names), rng.choice(csr.names)) for _ in range(queries)]
+    return csr, pairs
+
+
+def bench_ch_build(q61):
+    def setup(n, rng):
+        csr, _ = gen_grid_pairs(n, rng, q61)
+        return q61.ContractionHierarchy.build, (csr,)
+    return setup
+
+
+def bench_ch_query(q61):
+    def setup(n, rng):
+        csr, pairs = gen_grid_pairs(n, rng, q61)
+        ch = q61.ContractionHierarchy.build(csr)
+
+        def run():
+            for a, b in pairs:
+                ch.query(a, b)
+        return run, ()
+    return setup
+
+
+def bench_route_table(q61, pooled=False, cold=False):
+    """
+    safest_route_table with an empty cache. `pooled` lowers parallel_min_work
+    so the process-pool path runs at every size; `cold` also restarts the
+    pool on each call, so worker start-up is part of the time.
+    """
+    def setup(n, rng):
+        csr, _ = gen_grid_pairs(n, rng, q61)
+        side = int(csr.n ** 0.5)
+        depots = [f"J{r}_0" for r in range(0, side, max(1, side // 10))]
+        destinations = [f"J{r}_{side - 1}" for r in range(0, side, max(1, side // 20))]
+        if pooled:
+            csr.parallel_min_work = 0
+            workers = max(2, os.cpu_count() or 1)
+        else:
+            workers = None
+
+        def run():
+            if cold:
+                csr.close_pool()
+            csr.route_cache.clear()
+            q61.safest_route_table(csr, depots, destinations, workers)
+        if pooled and not cold:
+            run()  # start the pool outside the timed runs
+        return run, ()
+    return setup
+
+
+def bench_route_table_pool(q61):
+    return bench_route_table(q61, pooled=True)
+
+
+def bench_route_table_pool_cold(q61):
+    return bench_route_table(q61, pooled=True, cold=True)
+
+
+def bench_max_flow(q62):
+    def setup(n, rng):
+        net = q62.freight_network(n, hubs=max(1, n // 50), seed=rng.randrange(1 << 30))
+        return q62.max_flow_edmonds_karp, (net, 0, n - 1)
+    return setup
+
+
+def bench_dinic(q62):
+    def setup(n, rng):
+        net = q62.freight_network(n, hubs=max(1, n // 100), seed=rng.randrange(1 << 30))
+        return q62.max_flow_dinic, (net, 0, n - 1)
+    return setup
+
+
+def gen_edit_stream(n, rng, q62, pairs=50):
+    """freight_network plus `pairs` lane closures, each followed by its reopening."""
+    net = q62.freight_network(n, hubs=max(1, n // 50), seed=rng.randrange(1 << 30))
+    roads = [(u, v) for u in net for v in net[u]]
+    stream = []
+    for _ in range(pairs):
+        u, v = rng.choice(roads)
+        stream += [(u, v, rng.choice([0, net[u][v] // 2])), (u, v, net[u][v])]
+    return net, stream
+
+
+def bench_capacity_edits(q62):
+    def setup(n, rng):
+        net, stream = gen_edit_stream(n, rng, q62)
+        fn = q62.FlowNetwork(net, 0, n - 1)
+        fn.solve()
+
+        def run():
+            for u, v, c in stream:
+                fn.set_capacity(u, v, c)
+        return run, ()
+    return setup
+
+
+def bench_full_recompute(q62):
+    def setup(n, rng):
+        net, stream = gen_edit_stream(n, rng, q62)
+
+        def run():
+            for u, v, c in stream:
+                net[u][v] = c
+                q62.max_flow_dinic(net, 0, n - 1)
+        return run, ()
+    return setup
+
+
+# name -> (script, module name, benchmark factory, sizes, quick sizes)
+BENCHMARKS = {
+    "max_points_on_line": ("question1/1a.py", "q1a", bench_points,
+                           [100, 200, 400, 800], [50, 100]),
+    "keyword_segmentation": ("question1/1b.py", "q1b", bench_segmentation,
+                             [25, 50, 100, 200], [10, 25]),
+    "max_generation_path": ("question2/2.py", "q2", bench_generation,
+                            [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "max_trading_profit": ("question3/3.py", "q3", bench_trading,
+                           [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "allocate_hour": ("question4/4.py", "q4", bench_allocate,
+                      [3, 30, 300, 3_000], [3, 30]),
+    "run_simulation": ("question4/4.py", "q4", bench_simulation,
+                       [3, 30, 300, 3_000], [3, 30]),
+    "greedy_itinerary": ("question5/5a.py", "q5a", bench_itinerary,
+                         [10, 50, 200, 500], [10, 50]),
+    "compute_safest_routes": ("question6/1.py", "q6_1", bench_safest,
+                              [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "compute_safest_routes_csr": ("question6/1.py", "q6_1", bench_safest_csr,
+                                  [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "compile_and_search_csr": ("question6/1.py", "q6_1", bench_compile_and_search_csr,
+                               [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "ch_build": ("question6/1.py", "q6_1", bench_ch_build,
+                 [400, 1_600, 3_600], [100, 400]),
+    "ch_query_x200": ("question6/1.py", "q6_1", bench_ch_query,
+                      [400, 1_600, 3_600], [100, 400]),
+    "safest_route_table": ("question6/1.py", "q6_1", bench_route_table,
+                           [1_600, 3_600, 10_000], [400, 1_600]),
+    "route_table_pool": ("question6/1.py", "q6_1", bench_route_table_pool,
+                         [1_600, 3_600, 10_000], [400, 1_600]),
+    "route_table_pool_first_call": ("question6/1.py", "q6_1", bench_route_table_pool_cold,
+                                    [1_600, 3_600, 10_000], [400, 1_600]),
+    "max_flow_edmonds_karp": ("question6/2.py", "q6_2", bench_max_flow,
+                              [200, 1_000, 5_000], [200, 500]),
+    "max_flow_dinic": ("question6/2.py", "q6_2", bench_dinic,
+                       [1_000, 10_000, 100_000], [1_000, 5_000]),
+    "capacity_edits_x100": ("question6/2.py", "q6_2", bench_capacity_edits,
+                            [500, 1_000, 2_000], [200, 500]),
+    "full_recompute_x100": ("question6/2.py", "q6_2", bench_full_recompute,
+                            [500, 1_000, 2_000], [200, 500]),
+}
+
+
+def measure(fn, args, repeat):
+    """(best seconds, mean seconds, peak KiB) for fn(*args)."""
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), sum(times) / len(times), peak / 1024
+
+
+def run_suite(names, repeat=3, seed=0, quick=False):
+    """Runs the selected benchmarks; returns (results, skipped)."""
+    results, skipped, modules = [], {}, {}
+    for name in names:
+        script, mod_name, factory, sizes, quick_sizes = BENCHMARKS[name]
+        if mod_name not in modules:
+            try:
+                modules[mod_name] = load(script, mod_name)
+            except ImportError as e:
+                skipped[name] = f"{script}: {e}"
+                continue
+        setup = factory(modules[mod_name])
+        for n in (quick_sizes if quick else sizes):
+            fn, args = setup(n, random.Random(seed * 1_000_003 + n))
+            best, mean, peak = measure(fn, args, repeat)
+            results.append({"bench": name, "size": n, "best_s": best,
+                            "mean_s": mean, "peak_kib": peak})
+            print(f"{name:<28}{n:>9}{best:>11.4f}{mean:>11.4f}{peak:>12.1f}", flush=True)
+    return results, skipped
+
+
+def compare(results, baseline, threshold, min_delta_s=0.025,
+            mem_threshold=0.10, min_delta_kib=64.0):
+    """
+    Rows that got slower or hungrier than the baseline.
+
+    A time regression needs best_s to grow by more than `threshold` (ratio)
+    and by more than `min_delta_s` (absolute), so millisecond-scale rows do
+    not flap on scheduler noise. Peak memory is gated the same way with
+    `mem_threshold` and `min_delta_kib`.
+    """
+    base = {(r["bench"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = base.get((r["bench"], r["size"]))
+        if not old:
+            continue
+        for kind, key, limit, floor in (("time", "best_s", threshold, min_delta_s),
+                                        ("memory", "peak_kib", mem_threshold, min_delta_kib)):
+            before, after = old.get(key), r[key]
+            if not before or after - before <= floor:
+                continue
+            ratio = after / before
+            if ratio > 1 + limit:
+                regressions.append({"bench": r["bench"], "size": r["size"], "kind": kind,
+                                    "baseline": before, "current": after, "ratio": ratio})
+    return regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Scaling benchmarks for all question modules.")
+    ap.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--quick", action="store_true", help="small sizes only (smoke run)")
+    ap.add_argument("--out", help="write results JSON here")
+    ap.add_argument("--save-baseline", help="write results JSON as the new baseline")
+    ap.add_argument("--baseline", help="compare against this baseline JSON")
+    ap.add_argument("--threshold", type=float, default=0.25,
+                    help="allowed slowdown before a row counts as a regression (0.25 = 25%%)")
+    ap.add_argument("--min-delta-ms", type=float, default=25.0,
+                    help="ignore slowdowns smaller than this many milliseconds")
+    ap.add_argument("--mem-threshold", type=float, default=0.10,
+                    help="allowed growth of peak memory (0.10 = 10%%)")
+    ap.add_argument("--min-delta-kib", type=float, default=64.0,
+                    help="ignore peak-memory growth smaller than this many KiB")
+    args = ap.parse_args()
+
+    sys.setrecursionlimit(10_000)
+    print(f"{'Benchmark':<28}{'Size':>9}{'Best(s)':>11}{'Mean(s)':>11}{'Peak(KiB)':>12}")
+    print("-" * 71)
+    results, skipped = run_suite(args.only, args.repeat, args.seed, args.quick)
+    for name, reason in skipped.items():
+        print(f"{name:<28} skipped ({reason})")
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed,
+                 "repeat": args.repeat, "quick": args.quick},
+        "results": results,
+        "skipped": skipped,
+    }
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold,
+                                  args.min_delta_ms / 1000, args.mem_threshold,
+                                  args.min_delta_kib)
+        report["regressions"] = regressions
+        for r in regressions:
+            unit, fmt = ("s", ".4f") if r["kind"] == "time" else (" KiB", ".1f")
+            print(f"REGRESSION ({r['kind']}) {r['bench']} @ {r['size']}: "
+                  f"{r['baseline']:{fmt}}{unit} -> {r['current']:{fmt}}{unit} ({r['ratio']:.2f}x)")
+        print(f"{len(regressions)} regression(s) against {args.baseline}")
+        status = 1 if regressions else 0
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+    sys.exit(status)
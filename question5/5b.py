@@ -1,3 +1,5 @@
+import csv
+import json
 import threading
 import queue
 import time
@@ -20,8 +22,100 @@ CITIES = [
     {"name": "Dhangadhi", "lat": 28.7000, "lon": 80.5833},
 ]
 
-def fetch_city(city, result_queue, lock):
-    """Fetch weather for one city in a separate thread."""
+PERCENTILES = (50, 95, 99)
+PHASES = ("response", "total")
+
+
+class LatencyRecorder:
+    """
+    Thread-safe store of per-request timings (seconds).
+
+    Each record keeps two phases:
+    - response: time until the response headers arrived (requests' `elapsed`,
+      which already includes DNS lookup and connect; requests does not expose
+      those separately).
+    - total: wall time of the whole fetch, including body download and parsing.
+    """
+    def __init__(self):
+        self.records = []
+        self._lock = threading.Lock()
+
+    def record(self, city, total, response=None, ok=True):
+        with self._lock:
+            self.records.append({"city": city, "response": response,
+                                 "total": total, "ok": ok})
+
+    def samples(self, phase="total"):
+        """Sorted non-missing samples for one phase."""
+        with self._lock:
+            return sorted(r[phase] for r in self.records if r[phase] is not None)
+
+    def percentile(self, pct, phase="total"):
+        """Nearest-rank percentile, or None when nothing was recorded."""
+        data = self.samples(phase)
+        if not data:
+            return None
+        rank = max(1, -(-pct * len(data) // 100))  # ceil(pct/100 * n)
+        return data[rank - 1]
+
+    def histogram(self, phase="total", bins=10):
+        """Equal-width histogram as a list of (low, high, count) buckets."""
+        data = self.samples(phase)
+        if not data:
+            return []
+        lo, hi = data[0], data[-1]
+        width = (hi - lo) / bins or 1.0
+        counts = [0] * bins
+        for v in data:
+            counts[min(int((v - lo) / width), bins - 1)] += 1
+        return [(lo + i * width, lo + (i + 1) * width, c) for i, c in enumerate(counts)]
+
+    def summary(self):
+        """Count, error rate and p50/p95/p99 per phase."""
+        with self._lock:
+            n = len(self.records)
+            errors = sum(1 for r in self.records if not r["ok"])
+        out = {"count": n, "errors": errors,
+               "error_rate": errors / n if n else 0.0}
+        for phase in PHASES:
+            data = self.samples(phase)
+            stats = {"count": len(data),
+                     "min": data[0] if data else None,
+                     "max": data[-1] if data else None,
+                     "mean": sum(data) / len(data) if data else None}
+            for pct in PERCENTILES:
+                stats[f"p{pct}"] = self.percentile(pct, phase)
+            stats["histogram"] = self.histogram(phase)
+            out[phase] = stats
+        return out
+
+
+def export_latency(recorders, json_path=None, csv_path=None):
+    """
+    Write {mode: LatencyRecorder} to JSON (summaries + raw records)
+    and/or CSV (one row per request).
+    """
+    if json_path:
+        payload = {mode: {"summary": rec.summary(), "records": list(rec.records)}
+                   for mode, rec in recorders.items()}
+        with open(json_path, "w") as f:
+            json.dump(payload, f, indent=2)
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["mode", "city", "ok", "response_s", "total_s"])
+            for mode, rec in recorders.items():
+                for r in rec.records:
+                    writer.writerow([mode, r["city"], r["ok"], r["response"], r["total"]])
+
+
+def fetch_city(city, result_queue, lock, recorder=None, base_url=BASE_URL):
+    """
+    Fetch weather for one city in a separate thread.
+    If `recorder` is given, the request timing is added to it.
+    """
+    start = time.perf_counter()
+    response_t = None
     try:
         params = {
             "lat": city["lat"],
@@ -29,7 +123,8 @@ def fetch_city(city, result_queue, lock):
             "appid": API_KEY,
             "units": "metric"
         }
-        resp = requests.get(BASE_URL, params=params, timeout=10)
+        resp = requests.get(base_url, params=params, timeout=10)
+        response_t = resp.elapsed.total_seconds()
         data = resp.json()
         result = {
             "city": city["name"],
@@ -42,6 +137,10 @@ def fetch_city(city, result_queue, lock):
     except Exception as e:
         result = {"city": city["name"], "ok": False, "err": str(e)}
 
+    result["latency"] = time.perf_counter() - start
+    if recorder is not None:
+        recorder.record(city["name"], result["latency"], response_t, result["ok"])
+
     with lock:
         result_queue.put(result)
 
@@ -55,6 +154,7 @@ class WeatherApp:
         self.lock = threading.Lock()
         self.seq_t = None
         self.con_t = None
+        self.recorders = {}
         self._build_ui()
 
     def _build_ui(self):
@@ -70,17 +170,20 @@ class WeatherApp:
         tk.Button(btn_frame, text="Fetch (Sequential)",
                   font=("Times New Roman", 11), padx=10, pady=3,
                   command=self.fetch_sequential).pack(side=tk.LEFT, padx=8)
+        tk.Button(btn_frame, text="Export Latency",
+                  font=("Times New Roman", 11), padx=10, pady=3,
+                  command=self.export_latency).pack(side=tk.LEFT, padx=8)
 
         self.status = tk.StringVar(value="Ready.")
         tk.Label(self.master, textvariable=self.status,
                  font=("Times New Roman", 10)).pack()
 
         # Results table
-        cols = ("City", "Temp (C)", "Humidity (%)", "Pressure (hPa)", "Description")
+        cols = ("City", "Temp (C)", "Humidity (%)", "Pressure (hPa)", "Description", "Latency (ms)")
         self.tree = ttk.Treeview(self.master, columns=cols, show="headings", height=6)
         for c in cols:
             self.tree.heading(c, text=c)
-            self.tree.column(c, width=145, anchor="center")
+            self.tree.column(c, width=125, anchor="center")
         self.tree.pack(fill=tk.X, padx=10, pady=5)
 
         # Latency chart
@@ -96,19 +199,31 @@ class WeatherApp:
     def _insert(self, r):
         if r.get("ok"):
             self.tree.insert("", tk.END, values=(
-                r["city"], f"{r['temp']:.1f}", r["hum"], r["press"], r["desc"]))
+                r["city"], f"{r['temp']:.1f}", r["hum"], r["press"], r["desc"],
+                f"{r['latency'] * 1000:.0f}"))
         else:
             self.tree.insert("", tk.END, values=(
-                r["city"], "N/A", "N/A", "N/A", r.get("err", "Error")))
+                r["city"], "N/A", "N/A", "N/A", r.get("err", "Error"),
+                f"{r['latency'] * 1000:.0f}"))
+
+    def _latency_status(self, mode, elapsed):
+        s = self.recorders[mode].summary()
+        tot = s["total"]
+        if not tot["count"]:
+            return f"{mode} done in {elapsed:.2f}s"
+        return (f"{mode} done in {elapsed:.2f}s | p50 {tot['p50'] * 1000:.0f}ms "
+                f"p95 {tot['p95'] * 1000:.0f}ms p99 {tot['p99'] * 1000:.0f}ms | "
+                f"errors {s['errors']}/{s['count']}")
 
     def fetch_concurrent(self):
         self._clear()
         self.status.set("Fetching concurrently ...")
+        rec = self.recorders["Concurrent"] = LatencyRecorder()
         start = time.perf_counter()
         threads = []
 
         for city in CITIES:
-            t = threading.Thread(target=fetch_city, args=(city, self.rq, self.lock), daemon=True)
+            t = threading.Thread(target=fetch_city, args=(city, self.rq, self.lock, rec), daemon=True)
             threads.append(t)
             t.start()
 
@@ -119,7 +234,7 @@ class WeatherApp:
                 self.master.after(100, poll)
             else:
                 self.con_t = time.perf_counter() - start
-                self.status.set(f"Concurrent done in {self.con_t:.2f}s")
+                self.status.set(self._latency_status("Concurrent", self.con_t))
                 self._chart()
 
         self.master.after(100, poll)
@@ -128,15 +243,23 @@ class WeatherApp:
         self._clear()
         self.status.set("Fetching sequentially ...")
         q = queue.Queue()
+        rec = self.recorders["Sequential"] = LatencyRecorder()
         start = time.perf_counter()
         for city in CITIES:
-            fetch_city(city, q, self.lock)
+            fetch_city(city, q, self.lock, rec)
             self._insert(q.get())
             self.master.update()  # keep GUI responsive
         self.seq_t = time.perf_counter() - start
-        self.status.set(f"Sequential done in {self.seq_t:.2f}s")
+        self.status.set(self._latency_status("Sequential", self.seq_t))
         self._chart()
 
+    def export_latency(self):
+        if not self.recorders:
+            self.status.set("Nothing to export yet.")
+            return
+        export_latency(self.recorders, "latency_stats.json", "latency_stats.csv")
+        self.status.set("Latency written to latency_stats.json / latency_stats.csv")
+
     def _chart(self):
         self.ax.clear()
         labels, vals = [], []
@@ -147,13 +270,31 @@ class WeatherApp:
             labels.append("Concurrent")
             vals.append(self.con_t)
         if vals:
-            bars = self.ax.bar(labels, vals, color=["#777777", "#333333"][:len(vals)], width=0.35)
-            for bar, v in zip(bars, vals):
-                self.ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.02,
-                             f"{v:.2f}s", ha="center", fontsize=9, fontweight="bold")
+            # One group per mode: wall time, then per-request p50/p95/p99.
+            metrics = ["Total"] + [f"p{p}" for p in PERCENTILES]
+            width = 0.8 / len(metrics)
+            shades = ["#333333", "#777777", "#999999", "#bbbbbb"]
+            top = 0.0
+            for k, metric in enumerate(metrics):
+                heights = []
+                for mode, total in zip(labels, vals):
+                    if metric == "Total":
+                        heights.append(total)
+                    else:
+                        p = self.recorders[mode].percentile(int(metric[1:]))
+                        heights.append(p or 0.0)
+                xs = [i + (k - (len(metrics) - 1) / 2) * width for i in range(len(labels))]
+                bars = self.ax.bar(xs, heights, width=width, color=shades[k], label=metric)
+                for bar, v in zip(bars, heights):
+                    self.ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.02,
+                                 f"{v:.2f}s", ha="center", fontsize=7)
+                top = max(top, max(heights))
+            self.ax.set_xticks(range(len(labels)))
+            self.ax.set_xticklabels(labels)
             self.ax.set_ylabel("Time (s)")
             self.ax.set_title("Sequential vs Concurrent Latency", fontweight="bold")
-            self.ax.set_ylim(0, max(vals) * 1.4 + 0.5)
+            self.ax.set_ylim(0, top * 1.4 + 0.5)
+            self.ax.legend(fontsize=8, loc="upper right")
             self.fig.tight_layout()
             self.canvas.draw()
 
@@ -0,0 +1,175 @@
+"""
+Load benchmark for the weather dashboard's fetch modes.
+
+Starts a local mock of the OpenWeatherMap endpoint with configurable latency
+and failure injection, then drives every fetch mode in FETCH_MODES against it
+for a range of city counts. Per-request timings go into a LatencyRecorder;
+the results are printed and can be exported as JSON/CSV.
+
+Example:
+    python 5b_bench.py --cities 10 100 1000 --latency-ms 50 --jitter-ms 20 --fail-rate 0.02
+"""
+import argparse
+import importlib.util
+import json
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_spec = importlib.util.spec_from_file_location(
+    "weather_dashboard", os.path.join(os.path.dirname(os.path.abspath(__file__)), "5b.py"))
+weather = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(weather)
+
+
+# Mock server
+class MockWeatherHandler(BaseHTTPRequestHandler):
+    """Answers every GET like /data/2.5/weather after an injected delay."""
+    latency = 0.05
+    jitter = 0.0
+    fail_rate = 0.0
+    rng = random.Random(0)
+    rng_lock = threading.Lock()
+
+    def do_GET(self):
+        with self.rng_lock:
+            delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+            fail = self.rng.random() < self.fail_rate
+        time.sleep(delay)
+        if fail:
+            body, status = b'{"cod": 500, "message": "injected failure"}', 500
+        else:
+            body, status = json.dumps({
+                "main": {"temp": 21.5, "humidity": 60, "pressure": 1012},
+                "weather": [{"description": "clear sky"}],
+            }).encode(), 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockWeatherServer(ThreadingHTTPServer):
+    """Threaded server with a listen backlog deep enough for thousands of cities."""
+    request_queue_size = 1024
+    daemon_threads = True
+
+
+def start_mock_server(latency=0.05, jitter=0.0, fail_rate=0.0, seed=0):
+    """Start the mock server on a free port; returns (server, base_url)."""
+    handler = type("Handler", (MockWeatherHandler,), {
+        "latency": latency, "jitter": jitter, "fail_rate": fail_rate,
+        "rng": random.Random(seed),
+    })
+    server = MockWeatherServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/data/2.5/weather"
+
+
+def make_cities(n, seed=0):
+    """n synthetic cities spread over Nepal's bounding box."""
+    rng = random.Random(seed)
+    return [{"name": f"City{i}", "lat": rng.uniform(26.3, 30.4), "lon": rng.uniform(80.0, 88.2)}
+            for i in range(n)]
+
+
+# Fetch modes
+def fetch_sequential(cities, base_url, recorder, workers=None):
+    """Same as WeatherApp.fetch_sequential: one request after another."""
+    q, lock = queue.Queue(), threading.Lock()
+    for city in cities:
+        weather.fetch_city(city, q, lock, recorder, base_url)
+        q.get()
+
+
+def fetch_threaded(cities, base_url, recorder, workers=None):
+    """Same as WeatherApp.fetch_concurrent: one thread per city."""
+    q, lock = queue.Queue(), threading.Lock()
+    threads = [threading.Thread(target=weather.fetch_city,
+                                args=(city, q, lock, recorder, base_url), daemon=True)
+               for city in cities]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def fetch_pooled(cities, base_url, recorder, workers=32):
+    """Bounded thread pool, so thousands of cities don't mean thousands of threads."""
+    q, lock = queue.Queue(), threading.Lock()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for city in cities:
+            pool.submit(weather.fetch_city, city, q, lock, recorder, base_url)
+
+
+FETCH_MODES = {
+    "sequential": fetch_sequential,
+    "threaded": fetch_threaded,
+    "pooled": fetch_pooled,
+}
+
+
+def run_benchmark(sizes, modes, latency=0.05, jitter=0.0, fail_rate=0.0, workers=32, seed=0):
+    """
+    Run every mode at every size against a fresh mock server.
+    Returns ({f"{mode}@{n}": LatencyRecorder}, [summary rows]).
+    """
+    server, base_url = start_mock_server(latency, jitter, fail_rate, seed)
+    recorders, rows = {}, []
+    try:
+        for n in sizes:
+            cities = make_cities(n, seed)
+            for mode in modes:
+                rec = weather.LatencyRecorder()
+                start = time.perf_counter()
+                FETCH_MODES[mode](cities, base_url, rec, workers)
+                wall = time.perf_counter() - start
+                recorders[f"{mode}@{n}"] = rec
+                s = rec.summary()
+                rows.append({"mode": mode, "cities": n, "wall_s": wall,
+                             "throughput_rps": n / wall if wall else 0.0,
+                             "error_rate": s["error_rate"],
+                             **{f"p{p}_s": s["total"][f"p{p}"] for p in weather.PERCENTILES}})
+    finally:
+        server.shutdown()
+        server.server_close()
+    return recorders, rows
+
+
+def _fmt_ms(v):
+    return f"{v * 1000:>8.1f}" if v is not None else f"{'-':>8}"
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Benchmark weather fetch modes against a mock server.")
+    ap.add_argument("--cities", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--modes", nargs="+", choices=list(FETCH_MODES), default=list(FETCH_MODES))
+    ap.add_argument("--latency-ms", type=float, default=50.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--fail-rate", type=float, default=0.0)
+    ap.add_argument("--workers", type=int, default=32, help="pool size for the pooled mode")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", help="write summaries and raw records to this JSON file")
+    ap.add_argument("--csv", help="write one row per request to this CSV file")
+    args = ap.parse_args()
+
+    recs, results = run_benchmark(args.cities, args.modes, args.latency_ms / 1000,
+                                  args.jitter_ms / 1000, args.fail_rate, args.workers, args.seed)
+
+    print(f"{'Mode':<12}{'Cities':>7}{'Wall(s)':>9}{'Req/s':>9}"
+          f"{'p50(ms)':>9}{'p95(ms)':>9}{'p99(ms)':>9}{'Err%':>7}")
+    print("-" * 71)
+    for r in results:
+        print(f"{r['mode']:<12}{r['cities']:>7}{r['wall_s']:>9.2f}{r['throughput_rps']:>9.1f}"
+              f" {_fmt_ms(r['p50_s'])} {_fmt_ms(r['p95_s'])} {_fmt_ms(r['p99_s'])}"
+              f"{r['error_rate'] * 100:>6.1f}%")
+    if args.json or args.csv:
+        weather.export_latency(recs, args.json, args.csv)
@@ -1,5 +1,13 @@
 import heapq
+import json
 import math
+import os
+import pickle
+import random
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 
 def compute_safest_routes(graph, start):
@@ -46,6 +54,467 @@ def get_path(parent, start, end):
     route.reverse()
 
     return route if route and route[0] == start else []
+
+
+class CSRGraph:
+    """
+    Compiled form of an adjacency-list graph for repeated safest-route searches.
+
+    Nodes are integer ids 0..n-1 (`names[i]` <-> `ids[name]`). The out-edges
+    of node u are targets[offsets[u]:offsets[u + 1]], and `weights` holds the
+    matching -log(p) values, computed once at compile time.
+
+    `version` is bumped whenever an edge probability changes; results cached
+    by safest_route_table are keyed on it and dropped on every change, and
+    its worker pool (built for one version of the weights) is shut down.
+    """
+    cache_size = 1024
+    # Below this many node-searches (len(sources) * n) a table runs serially:
+    # starting worker processes would cost more than it saves.
+    parallel_min_work = 500_000
+
+    def __init__(self, names, offsets, targets, weights):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.version = 0
+        self.route_cache = OrderedDict()
+        self.pool = None
+        self.pool_key = None
+
+    @property
+    def n(self):
+        return len(self.names)
+
+    def set_probability(self, u, v, prob):
+        """Changes the safety probability of every u -> v edge (names)."""
+        a, b = self.ids[u], self.ids[v]
+        found = False
+        for e in range(self.offsets[a], self.offsets[a + 1]):
+            if self.targets[e] == b:
+                self.weights[e] = -math.log(prob)
+                found = True
+        if not found:
+            raise KeyError(f"no edge {u} -> {v}")
+        self.version += 1
+        self.route_cache.clear()
+        self.close_pool()
+
+    def close_pool(self):
+        """Shuts down the worker pool used by safest_route_table, if any."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = self.pool_key = None
+
+    def __getstate__(self):
+        # Workers get the arrays only; the cache and pool stay in the parent.
+        state = self.__dict__.copy()
+        state.update(route_cache=OrderedDict(), pool=None, pool_key=None)
+        return state
+
+
+def compile_graph(graph):
+    """
+    Converts a dict-of-lists graph {node: [(neighbor, prob), ...]} into a CSRGraph.
+
+    Complexity:
+    Time  -> O(V + E)
+    Space -> O(V + E)
+    """
+    names = list(graph)
+    ids = {name: i for i, name in enumerate(names)}
+    for edges in graph.values():
+        for neighbor, _ in edges:
+            if neighbor not in ids:
+                ids[neighbor] = len(names)
+                names.append(neighbor)
+
+    offsets = array('l', [0]) * (len(names) + 1)
+    targets = array('l')
+    weights = array('d')
+    for i, name in enumerate(names):
+        for neighbor, prob in graph.get(name, ()):
+            targets.append(ids[neighbor])
+            weights.append(-math.log(prob))
+        offsets[i + 1] = len(targets)
+
+    return CSRGraph(names, offsets, targets, weights)
+
+
+def compute_safest_routes_csr(csr, start, stop_at=None):
+    """
+    Same search as compute_safest_routes, over a CSRGraph.
+
+    `start` is a node name; the result is (dist, parent) arrays indexed by
+    node id, with parent[v] == -1 for the start and unreachable nodes.
+    If `stop_at` (node names) is given, the search ends as soon as all of
+    them are settled; only those entries are then guaranteed final.
+
+    Complexity:
+    Time  -> O((V + E) log V)
+    Space -> O(V)
+    """
+    n = csr.n
+    offsets, targets, weights = csr.offsets, csr.targets, csr.weights
+    dist = array('d', [math.inf]) * n
+    parent = array('l', [-1]) * n
+
+    source = csr.ids[start]
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    heappop, heappush = heapq.heappop, heapq.heappush
+    pending = {csr.ids[name] for name in stop_at} if stop_at is not None else None
+
+    while heap:
+        current_dist, u = heappop(heap)
+        if current_dist > dist[u]:
+            continue
+        if pending is not None:
+            pending.discard(u)
+            if not pending:
+                break
+        for e in range(offsets[u], offsets[u + 1]):
+            v = targets[e]
+            candidate_dist = current_dist + weights[e]
+            if candidate_dist < dist[v]:
+                dist[v] = candidate_dist
+                parent[v] = u
+                heappush(heap, (candidate_dist, v))
+
+    return dist, parent
+
+
+def get_path_csr(csr, parent, start, end):
+    """get_path for the arrays returned by compute_safest_routes_csr (names in, names out)."""
+    route = []
+    node = csr.ids[end]
+
+    while node != -1:
+        route.append(csr.names[node])
+        node = parent[node]
+    route.reverse()
+
+    return route if route and route[0] == start else []
+
+
+class ContractionHierarchy:
+    """
+    Shortcut index over the -log(p) graph for fast point-to-point safest routes.
+
+    Preprocessing contracts nodes one at a time (least important first, by
+    edge difference) and adds a shortcut u -> x through v whenever the route
+    u -> v -> x has no equally safe witness path avoiding v. A query then only
+    needs a bidirectional Dijkstra that climbs to higher-ranked nodes.
+
+    Edges are kept as {(u, v): (weight, middle)} with middle == -1 for
+    original roads, so shortcuts can be unpacked back into junctions.
+    """
+    def __init__(self, names, rank, edges):
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.rank = rank
+        self.edges = edges
+        # Forward search follows u -> v upwards; backward search follows
+        # u -> v in reverse from v, again only towards higher rank.
+        self.up = [[] for _ in names]
+        self.down = [[] for _ in names]
+        for (u, v), (w, _) in edges.items():
+            if rank[v] > rank[u]:
+                self.up[u].append((v, w))
+            else:
+                self.down[v].append((u, w))
+
+    @classmethod
+    def build(cls, csr, settle_limit=60):
+        """
+        Contracts every node of a CSRGraph.
+
+        `settle_limit` bounds each witness search; a smaller limit is faster
+        but may add unnecessary (still correct) shortcuts.
+        """
+        n = csr.n
+        out_adj = [{} for _ in range(n)]
+        in_adj = [{} for _ in range(n)]
+        edges = {}
+        for u in range(n):
+            for e in range(csr.offsets[u], csr.offsets[u + 1]):
+                v, w = csr.targets[e], csr.weights[e]
+                if u != v and ((u, v) not in edges or w < edges[(u, v)][0]):
+                    edges[(u, v)] = (w, -1)
+                    out_adj[u][v] = w
+                    in_adj[v][u] = w
+
+        def witness(u, skip, limit):
+            """Bounded Dijkstra from u that never passes through `skip`."""
+            dist = {u: 0.0}
+            heap = [(0.0, u)]
+            settled = 0
+            while heap and settled < settle_limit:
+                d, x = heapq.heappop(heap)
+                if d > dist[x]:
+                    continue
+                if d > limit:
+                    break
+                settled += 1
+                for y, w in out_adj[x].items():
+                    nd = d + w
+                    if y != skip and nd < dist.get(y, math.inf):
+                        dist[y] = nd
+                        heapq.heappush(heap, (nd, y))
+            return dist
+
+        def shortcuts(v):
+            """Shortcuts needed to contract v, as (u, x, weight) triples."""
+            found = []
+            if not out_adj[v]:
+                return found
+            max_out = max(out_adj[v].values())
+            for u, w1 in in_adj[v].items():
+                dist = witness(u, v, w1 + max_out)
+                for x, w2 in out_adj[v].items():
+                    if x != u and dist.get(x, math.inf) > w1 + w2:
+                        found.append((u, x, w1 + w2))
+            return found
+
+        deleted = [0] * n
+
+        def priority(v):
+            return (len(shortcuts(v)) - len(in_adj[v]) - len(out_adj[v])
+                    + deleted[v])
+
+        heap = [(priority(v), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = [0] * n
+        done = bytearray(n)
+        order = 0
+
+        while heap:
+            _, v = heapq.heappop(heap)
+            if done[v]:
+                continue
+            # Lazy update: re-evaluate and requeue if no longer the minimum.
+            p = priority(v)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))
+                continue
+
+            for u, x, w in shortcuts(v):
+                if w < out_adj[u].get(x, math.inf):
+                    out_adj[u][x] = w
+                    in_adj[x][u] = w
+                    edges[(u, x)] = (w, v)
+            for u in in_adj[v]:
+                del out_adj[u][v]
+                deleted[u] += 1
+            for x in out_adj[v]:
+                del in_adj[x][v]
+                deleted[x] += 1
+            in_adj[v] = {}
+            out_adj[v] = {}
+            done[v] = 1
+            rank[v] = order
+            order += 1
+
+        return cls(list(csr.names), rank, edges)
+
+    def query(self, start, end):
+        """
+        Safest route between two named nodes.
+
+        Returns (distance, path) in the same form as compute_safest_routes /
+        get_path: distance is the -log of the route's safety, and path is a
+        list of node names ([] and inf when unreachable).
+        """
+        s, t = self.ids[start], self.ids[end]
+        if s == t:
+            return 0.0, [start]
+
+        dist = ({s: 0.0}, {t: 0.0})
+        parent = ({s: -1}, {t: -1})
+        heaps = ([(0.0, s)], [(0.0, t)])
+        graphs = (self.up, self.down)
+        best, meet = math.inf, -1
+        side = 0
+
+        while True:
+            active = [k for k in (0, 1) if heaps[k] and heaps[k][0][0] < best]
+            if not active:
+                break
+            side = active[0] if len(active) == 1 else 1 - side
+            d, u = heapq.heappop(heaps[side])
+            if d > dist[side][u]:
+                continue
+            other = dist[1 - side].get(u)
+            if other is not None and d + other < best:
+                best, meet = d + other, u
+            for v, w in graphs[side][u]:
+                nd = d + w
+                if nd < dist[side].get(v, math.inf):
+                    dist[side][v] = nd
+                    parent[side][v] = u
+                    heapq.heappush(heaps[side], (nd, v))
+
+        if meet == -1:
+            return math.inf, []
+
+        up_path = []
+        node = meet
+        while node != -1:
+            up_path.append(node)
+            node = parent[0][node]
+        up_path.reverse()
+        node = parent[1][meet]
+        while node != -1:
+            up_path.append(node)
+            node = parent[1][node]
+
+        route = [up_path[0]]
+        for a, b in zip(up_path, up_path[1:]):
+            route.extend(self._unpack(a, b))
+        return best, [self.names[i] for i in route]
+
+    def _unpack(self, u, v):
+        """Original junctions after u on the (possibly shortcut) edge u -> v."""
+        out = []
+        stack = [(u, v)]
+        while stack:
+            a, b = stack.pop()
+            mid = self.edges[(a, b)][1]
+            if mid == -1:
+                out.append(b)
+            else:
+                stack.append((mid, b))
+                stack.append((a, mid))
+        return out
+
+    def save(self, path):
+        """Writes the hierarchy to a JSON file."""
+        with open(path, "w") as f:
+            json.dump({"names": self.names, "rank": self.rank,
+                       "edges": [[u, v, w, m] for (u, v), (w, m) in self.edges.items()]}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a hierarchy written by save()."""
+        with open(path) as f:
+            data = json.load(f)
+        edges = {(u, v): (w, m) for u, v, w, m in data["edges"]}
+        return cls(data["names"], data["rank"], edges)
+
+
+_POOL_GRAPH = None
+
+
+def _init_pool(csr):
+    """Worker initializer: each process keeps one read-only copy of the graph."""
+    global _POOL_GRAPH
+    _POOL_GRAPH = csr
+
+
+def _target_distances(csr, source, targets):
+    dist, _ = compute_safest_routes_csr(csr, source, stop_at=targets)
+    return {t: dist[csr.ids[t]] for t in targets}
+
+
+def _pool_search(source, targets):
+    return source, _target_distances(_POOL_GRAPH, source, targets)
+
+
+def _route_pool(csr, workers):
+    """The graph's worker pool for its current version, started on first use."""
+    key = (csr.version, workers)
+    if csr.pool_key != key:
+        csr.close_pool()
+        csr.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_pool,
+                                       initargs=(csr,))
+        csr.pool_key = key
+    return csr.pool
+
+
+def safest_route_table(csr, sources, targets, workers=None):
+    """
+    Safety matrix {source: {target: distance}} between named nodes.
+
+    Distances are -log(safety) as in compute_safest_routes (inf when
+    unreachable). Each source runs one early-stopping search, and results
+    are kept in an LRU cache keyed by (source, csr.version).
+
+    Large tables are fanned out over a process pool that holds one copy of
+    the graph per worker and is reused until the graph changes (or
+    csr.close_pool() is called). Workers look up `_pool_search` by module
+    name: under the fork start method this file must be run as a script or
+    registered in sys.modules, and under spawn (the macOS/Windows default)
+    workers re-import it, so it must also be importable by that name from
+    sys.path. If workers cannot find it, the pool is discarded and the table
+    is computed serially.
+    """
+    targets = list(targets)
+    cache = csr.route_cache
+    table, todo = {}, {}
+    for source in sources:
+        hit = cache.get((source, csr.version))
+        if hit is not None:
+            cache.move_to_end((source, csr.version))
+            missing = [t for t in targets if t not in hit]
+        else:
+            missing = targets
+        if missing:
+            todo[source] = missing
+        else:
+            table[source] = {t: hit[t] for t in targets}
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    found = None
+    if workers > 1 and len(todo) * csr.n >= csr.parallel_min_work:
+        try:
+            found = list(_route_pool(csr, workers).map(_pool_search, todo, todo.values()))
+        except (pickle.PicklingError, BrokenProcessPool):
+            csr.close_pool()
+    if found is None:
+        found = [(source, _target_distances(csr, source, missing))
+                 for source, missing in todo.items()]
+
+    for source, dists in found:
+        key = (source, csr.version)
+        entry = cache.setdefault(key, {})
+        entry.update(dists)
+        cache.move_to_end(key)
+        table[source] = {t: entry[t] for t in targets}
+    while len(cache) > csr.cache_size:
+        cache.popitem(last=False)
+
+    return {source: table[source] for source in sources}
+
+
+def random_road_graph(n, avg_degree=4, seed=0):
+    """Seeded random dict-of-lists graph with n junctions and safety probabilities in [0.5, 1)."""
+    rng = random.Random(seed)
+    names = [f"J{i}" for i in range(n)]
+    graph = {name: [] for name in names}
+    for i in range(n):
+        # A ring keeps every junction reachable; the rest are random roads.
+        graph[names[i]].append((names[(i + 1) % n], rng.uniform(0.5, 0.999)))
+        for _ in range(avg_degree - 1):
+            graph[names[i]].append((names[rng.randrange(n)], rng.uniform(0.5, 0.999)))
+    return graph
+
+
+def grid_road_graph(rows, cols, seed=0):
+    """Seeded two-way grid road network (closer to real roads than random_road_graph)."""
+    rng = random.Random(seed)
+    graph = {f"J{r}_{c}": [] for r in range(rows) for c in range(cols)}
+    for r in range(rows):
+        for c in range(cols):
+            for dr, dc in ((0, 1), (1, 0)):
+                if r + dr < rows and c + dc < cols:
+                    p = rng.uniform(0.5, 0.999)
+                    graph[f"J{r}_{c}"].append((f"J{r + dr}_{c + dc}", p))
+                    graph[f"J{r + dr}_{c + dc}"].append((f"J{r}_{c}", p))
+    return graph
+
+
 # Graph definition
 GRAPH = {
     'KTM': [('JA', 0.90), ('JB', 0.80)],
@@ -64,7 +533,36 @@ if __name__ == "__main__":
 
         print(f"KTM -> {destination}: safety = {safety_score:.4f} "
               f"path = {' -> '.join(path)}")
-        
 
+    print("\n=== CSR search, same graph ===")
+    csr_graph = compile_graph(GRAPH)
+    dist_arr, parent_arr = compute_safest_routes_csr(csr_graph, 'KTM')
+    for destination in ['JA', 'JB', 'PH', 'BS']:
+        same = abs(dist_arr[csr_graph.ids[destination]] - dist_map[destination]) < 1e-12
+        path = get_path_csr(csr_graph, parent_arr, 'KTM', destination)
+        print(f"KTM -> {destination}: path = {' -> '.join(path)} "
+              f"{'PASS' if same and path == get_path(parent_map, 'KTM', destination) else 'FAIL'}")
+
+    csr_ok = True
+    for k in range(10):
+        road_graph = random_road_graph(500, seed=k)
+        dist_dict, _ = compute_safest_routes(road_graph, 'J0')
+        road_csr = compile_graph(road_graph)
+        dist_csr, _ = compute_safest_routes_csr(road_csr, 'J0')
+        csr_ok &= all(abs(dist_dict[name] - dist_csr[i]) < 1e-9
+                      for i, name in enumerate(road_csr.names))
+    print(f"CSR == dict distances on 10 random road graphs: {csr_ok}")
+
+    ch = ContractionHierarchy.build(csr_graph)
+    ch_ok = True
+    for destination in ['JA', 'JB', 'PH', 'BS']:
+        d, path = ch.query('KTM', destination)
+        ch_ok &= abs(d - dist_map[destination]) < 1e-12
+        ch_ok &= path == get_path(parent_map, 'KTM', destination)
+    print(f"\nContraction hierarchy matches Dijkstra: {'PASS' if ch_ok else 'FAIL'}")
 
-        
\ No newline at end of file
+    table = safest_route_table(csr_graph, ['KTM', 'JB'], ['PH', 'BS'], workers=1)
+    table_ok = all(abs(table['KTM'][d] - dist_map[d]) < 1e-12 for d in ['PH', 'BS'])
+    csr_graph.set_probability('JA', 'PH', 0.5)
+    table_ok &= not csr_graph.route_cache
+    print(f"Route table matches Dijkstra, cache cleared on edit: {'PASS' if table_ok else 'FAIL'}")
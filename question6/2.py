@@ -1,3 +1,6 @@
+import json
+import random
+from array import array
 from collections import defaultdict, deque
 
 
@@ -50,9 +53,411 @@ def max_flow_edmonds_karp(cap_graph, src, dst):
             res_net[prev][node] -= flow
             res_net[node][prev] += flow
             node = prev
-            total_flow += flow
+        total_flow += flow
 
     return total_flow
+
+
+class ResidualGraph:
+    """
+    Array-based residual network.
+
+    Arc 2k is the forward arc of the k-th edge and arc 2k + 1 its reverse, so
+    the partner of arc e is always e ^ 1. `head[e]` is the arc's end node,
+    `cap[e]` its residual capacity and `adj[u]` the arcs leaving u.
+    """
+    def __init__(self, n):
+        self.adj = [[] for _ in range(n)]
+        self.head = array('l')
+        self.cap = []
+
+    def add_edge(self, u, v, capacity):
+        """Adds u -> v and returns the index of its forward arc."""
+        e = len(self.cap)
+        self.head.append(v)
+        self.cap.append(capacity)
+        self.adj[u].append(e)
+        self.head.append(u)
+        self.cap.append(0)
+        self.adj[v].append(e + 1)
+        return e
+
+    def dinic(self, s, t, limit=float('inf')):
+        """
+        Pushes up to `limit` more units from s to t on the current residual
+        state (Dinic: BFS level graph + blocking flow) and returns the amount.
+
+        Complexity:
+        Time  -> O(V^2 * E)
+        Space -> O(V + E)
+        """
+        if s == t:
+            raise ValueError("source and sink must differ")
+        adj, head, cap = self.adj, self.head, self.cap
+        n = len(adj)
+        total = 0
+
+        while total < limit:
+            #  Step 1: BFS level graph
+            level = [-1] * n
+            level[s] = 0
+            q = deque([s])
+            while q:
+                u = q.popleft()
+                if level[t] >= 0 and level[u] >= level[t]:
+                    break  # deeper nodes cannot be on a shortest path
+                for e in adj[u]:
+                    v = head[e]
+                    if cap[e] > 0 and level[v] < 0:
+                        level[v] = level[u] + 1
+                        q.append(v)
+            if level[t] < 0:
+                break
+
+            #  Step 2: blocking flow with per-node arc pointers
+            it = [0] * n
+            path = []
+            u = s
+            while total < limit:
+                if u != t:
+                    arcs = adj[u]
+                    while it[u] < len(arcs):
+                        e = arcs[it[u]]
+                        if cap[e] > 0 and level[head[e]] == level[u] + 1:
+                            break
+                        it[u] += 1
+                    else:
+                        # Dead end: drop u from the level graph and retreat.
+                        level[u] = -1
+                        if not path:
+                            break
+                        u = head[path.pop() ^ 1]
+                        it[u] += 1
+                        continue
+                    path.append(e)
+                    u = head[e]
+                    continue
+
+                #  Step 3: augment, then retreat to the first saturated arc
+                flow = limit - total
+                for e in path:
+                    if cap[e] < flow:
+                        flow = cap[e]
+                for e in path:
+                    cap[e] -= flow
+                    cap[e ^ 1] += flow
+                total += flow
+                for i, e in enumerate(path):
+                    if cap[e] == 0:
+                        del path[i:]
+                        u = head[e ^ 1]
+                        break
+
+        return total
+
+
+def build_residual(cap_graph):
+    """
+    ResidualGraph for a {u: {v: capacity}} network.
+    Returns (residual, names, ids, arcs) with arcs[(u, v)] = forward arc index.
+    """
+    names = list(cap_graph)
+    ids = {name: i for i, name in enumerate(names)}
+    for edges in cap_graph.values():
+        for v in edges:
+            if v not in ids:
+                ids[v] = len(names)
+                names.append(v)
+
+    res = ResidualGraph(len(names))
+    arcs = {}
+    for u in cap_graph:
+        for v, capacity in cap_graph[u].items():
+            arcs[(u, v)] = res.add_edge(ids[u], ids[v], capacity)
+    return res, names, ids, arcs
+
+
+def max_flow_dinic(cap_graph, src, dst):
+    """
+    Maximum flow with Dinic's algorithm on an array-based residual graph.
+    Same input and result as max_flow_edmonds_karp.
+
+    Complexity:
+    Time  -> O(V^2 * E)
+    Space -> O(V + E)
+    """
+    res, _, ids, _ = build_residual(cap_graph)
+    return res.dinic(ids[src], ids[dst])
+
+
+class FlowNetwork:
+    """
+    Max flow between two fixed junctions that keeps its residual graph and
+    flow between calls, so capacity edits only repair the current flow:
+
+    - increase: the edge gains residual capacity; augment from the current flow.
+    - decrease below the edge's flow: the excess is first rerouted from u to v
+      around the edge, and whatever cannot be rerouted is pushed back from u
+      to the source and from the sink to v.
+    """
+    def __init__(self, cap_graph, src, dst):
+        self.res, self.names, self.ids, self.arcs = build_residual(cap_graph)
+        self.src, self.dst = self.ids[src], self.ids[dst]
+        self.flow = 0
+
+    def solve(self):
+        """Augments from the current flow to a maximum flow and returns its value."""
+        self.flow += self.res.dinic(self.src, self.dst)
+        return self.flow
+
+    def capacity(self, u, v):
+        """Current capacity of road u -> v."""
+        e = self.arcs[(u, v)]
+        return self.res.cap[e] + self.res.cap[e ^ 1]
+
+    def edge_flow(self, u, v):
+        """Flow currently carried by road u -> v."""
+        return self.res.cap[self.arcs[(u, v)] ^ 1]
+
+    def _node(self, name):
+        if name not in self.ids:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.res.adj.append([])
+        return self.ids[name]
+
+    def set_capacity(self, u, v, capacity):
+        """Sets the capacity of road u -> v (adding it if new) and returns the new max flow."""
+        if (u, v) not in self.arcs:
+            self.arcs[(u, v)] = self.res.add_edge(self._node(u), self._node(v), capacity)
+            return self.solve()
+
+        e = self.arcs[(u, v)]
+        cap = self.res.cap
+        flow = cap[e ^ 1]
+        if capacity >= flow:
+            increased = capacity > cap[e] + flow
+            cap[e] = capacity - flow
+            return self.solve() if increased else self.flow
+
+        excess = flow - capacity
+        cap[e] = 0
+        cap[e ^ 1] = capacity
+        a, b = self.ids[u], self.ids[v]
+        excess -= self.res.dinic(a, b, excess)
+        if excess:
+            if a != self.src:
+                self.res.dinic(a, self.src, excess)
+            if b != self.dst:
+                self.res.dinic(self.dst, b, excess)
+            self.flow -= excess
+        return self.flow
+
+    def min_cut(self):
+        """
+        (source_side, cut_edges) from the current residual graph; a minimum
+        cut once solve() has run.
+        """
+        cap, head, adj = self.res.cap, self.res.head, self.res.adj
+        seen = bytearray(len(self.names))
+        seen[self.src] = 1
+        q = deque([self.src])
+        while q:
+            u = q.popleft()
+            for e in adj[u]:
+                if cap[e] > 0 and not seen[head[e]]:
+                    seen[head[e]] = 1
+                    q.append(head[e])
+        side = {name for i, name in enumerate(self.names) if seen[i]}
+        cut_edges = [(u, v, self.capacity(u, v)) for (u, v), e in self.arcs.items()
+                     if seen[self.ids[u]] and not seen[self.ids[v]] and self.capacity(u, v) > 0]
+        return side, cut_edges
+
+
+def min_cut(network, s, t):
+    """
+    Minimum s-t cut of a {u: {v: capacity}} network.
+
+    Returns (source_side, cut_edges): the set of junctions still reachable
+    from s in the final residual graph, and the (u, v, capacity) roads
+    leaving that set. The capacities of cut_edges sum to the max flow.
+    """
+    fn = FlowNetwork(network, s, t)
+    fn.solve()
+    return fn.min_cut()
+
+
+class GomoryHuTree:
+    """
+    Gomory-Hu cut tree: the max flow between any two junctions equals the
+    smallest edge weight on their tree path, and removing that edge splits
+    the junctions into a minimum cut.
+
+    Cut trees only exist for undirected capacities: every answer is for
+    two-way roads, not directed freight capacity. build() rejects networks
+    where c(u, v) != c(v, u) unless symmetrize=True, which reads each road
+    as two-way with capacity max(c(u, v), c(v, u)).
+
+    Built with Gusfield's algorithm (n - 1 max-flow calls, no contraction).
+    `parent[i]` / `weight[i]` describe the tree edge from node i upwards;
+    node 0 is the root.
+    """
+    def __init__(self, names, parent, weight, roads):
+        if not names:
+            raise ValueError("a Gomory-Hu tree needs at least one junction")
+        self.names = names
+        self.ids = {name: i for i, name in enumerate(names)}
+        self.parent = parent
+        self.weight = weight
+        self.roads = roads
+        self.children = [[] for _ in names]
+        for i in range(1, len(names)):
+            self.children[parent[i]].append(i)
+        self.depth = [0] * len(names)
+        stack = [0]
+        while stack:
+            u = stack.pop()
+            for c in self.children[u]:
+                self.depth[c] = self.depth[u] + 1
+                stack.append(c)
+
+    @classmethod
+    def build(cls, network, symmetrize=False):
+        """
+        Builds the tree for a {u: {v: capacity}} network of two-way roads
+        with n - 1 max-flow calls.
+
+        Raises ValueError for an empty network, or for a one-way or
+        asymmetric road (c(u, v) != c(v, u), a missing direction counting
+        as 0) unless `symmetrize` is set.
+        """
+        if not network:
+            raise ValueError("a Gomory-Hu tree needs at least one junction")
+        roads = {}
+        for u in network:
+            for v, capacity in network[u].items():
+                if u == v:
+                    continue
+                back = network.get(v, {}).get(u, 0)
+                if capacity != back and not symmetrize:
+                    raise ValueError(
+                        f"capacity {u}->{v} ({capacity}) differs from {v}->{u} ({back}); "
+                        "pass symmetrize=True to treat roads as two-way")
+                key = (u, v) if (v, u) not in roads else (v, u)
+                roads[key] = max(roads.get(key, 0), capacity)
+        names = list(network)
+        ids = {name: i for i, name in enumerate(names)}
+        for edges in network.values():
+            for v in edges:
+                if v not in ids:
+                    ids[v] = len(names)
+                    names.append(v)
+        undirected = {name: {} for name in names}
+        for (u, v), capacity in roads.items():
+            undirected[u][v] = capacity
+            undirected[v][u] = capacity
+
+        n = len(names)
+        parent, weight = [0] * n, [0] * n
+        for s in range(1, n):
+            t = parent[s]
+            fn = FlowNetwork(undirected, names[s], names[t])
+            value = fn.solve()
+            side, _ = fn.min_cut()
+            weight[s] = value
+            for i in range(n):
+                if i != s and names[i] in side and parent[i] == t:
+                    parent[i] = s
+            if names[parent[t]] in side:
+                parent[s] = parent[t]
+                parent[t] = s
+                weight[s] = weight[t]
+                weight[t] = value
+
+        return cls(names, parent, weight, [[u, v, c] for (u, v), c in roads.items()])
+
+    def _min_edge(self, u, v):
+        """Node x whose tree edge (x, parent[x]) is the lightest on the u-v path."""
+        a, b = self.ids[u], self.ids[v]
+        best = None
+        while a != b:
+            if self.depth[a] < self.depth[b]:
+                a, b = b, a
+            if best is None or self.weight[a] < self.weight[best]:
+                best = a
+            a = self.parent[a]
+        return best
+
+    def max_flow(self, u, v):
+        """
+        Max flow between junctions u and v over two-way roads (not directed
+        capacity), O(n).
+        """
+        x = self._min_edge(u, v)
+        return float('inf') if x is None else self.weight[x]
+
+    def min_cut(self, u, v):
+        """
+        (u_side, cut_edges) for a minimum u-v cut of the two-way road
+        network, O(n + E): the junctions on u's side and the (a, b, capacity)
+        roads with a on u's side and b not.
+        """
+        x = self._min_edge(u, v)
+        if x is None:
+            raise ValueError("source and sink must differ")
+        subtree = set()
+        stack = [x]
+        while stack:
+            node = stack.pop()
+            subtree.add(self.names[node])
+            stack.extend(self.children[node])
+        side = subtree if u in subtree else set(self.names) - subtree
+        cut_edges = []
+        for a, b, capacity in self.roads:
+            if a in side and b not in side:
+                cut_edges.append((a, b, capacity))
+            elif b in side and a not in side:
+                cut_edges.append((b, a, capacity))
+        return side, cut_edges
+
+    def save(self, path):
+        """Writes the tree to a JSON file."""
+        with open(path, "w") as f:
+            json.dump({"names": self.names, "parent": self.parent,
+                       "weight": self.weight, "roads": self.roads}, f)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a tree written by save()."""
+        with open(path) as f:
+            data = json.load(f)
+        return cls(data["names"], data["parent"], data["weight"], data["roads"])
+
+
+def random_network(n, m, max_cap=20, seed=0):
+    """Seeded random {u: {v: capacity}} network with n junctions and about m roads."""
+    rng = random.Random(seed)
+    net = {i: {} for i in range(n)}
+    for _ in range(m):
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v:
+            net[u][v] = rng.randint(1, max_cap)
+    return net
+
+
+def freight_network(n, avg_degree=4, hubs=1000, seed=0):
+    """
+    random_network where junction 0 feeds `hubs` random junctions and
+    `hubs` others feed junction n - 1, so 0 -> n - 1 carries real flow.
+    """
+    net = random_network(n, n * avg_degree, seed=seed)
+    rng = random.Random(seed)
+    for _ in range(hubs):
+        net[0][rng.randrange(1, n - 1)] = 100
+        net[rng.randrange(1, n - 1)][n - 1] = 100
+    return net
+
+
 #  Graph data 
 NETWORK = {
     'KTM': {'JA': 10, 'JB': 15},
@@ -65,5 +470,35 @@ if __name__ == "__main__":
     max_result = max_flow_edmonds_karp(NETWORK, 'KTM', 'BS')
 
     print(f"Maximum flow (trucks/hour): {max_result}")
-    print(f"Min-cut: JA->BS(5) + JB->BS(12) + PH->BS(6) = 23")
-    print(f"Max-flow == Min-cut: {max_result == 23}")
\ No newline at end of file
+    side, cut = min_cut(NETWORK, 'KTM', 'BS')
+    cut_value = sum(c for _, _, c in cut)
+    print("Min-cut: " + " + ".join(f"{u}->{v}({c})" for u, v, c in cut) + f" = {cut_value}")
+    print(f"Max-flow == Min-cut: {max_result == cut_value}")
+
+    print(f"Dinic on same network: {max_flow_dinic(NETWORK, 'KTM', 'BS')}")
+    agree = all(max_flow_dinic(net, 0, 1) == max_flow_edmonds_karp(net, 0, 1)
+                for net in (random_network(30, 120, seed=k) for k in range(50)))
+    print(f"Dinic == Edmonds-Karp on 50 random graphs: {agree}")
+
+    fn = FlowNetwork(NETWORK, 'KTM', 'BS')
+    fn.solve()
+    print(f"Close JB->BS: {fn.set_capacity('JB', 'BS', 0)} | "
+          f"reopen: {fn.set_capacity('JB', 'BS', 12)}")
+    replay_ok = True
+    for k in range(20):
+        net = random_network(30, 120, seed=k)
+        rng = random.Random(k)
+        fn = FlowNetwork(net, 0, 1)
+        fn.solve()
+        for _ in range(30):
+            u, v = rng.randrange(30), rng.randrange(30)
+            if u != v:
+                net[u][v] = rng.randint(0, 25)
+                replay_ok &= fn.set_capacity(u, v, net[u][v]) == max_flow_dinic(net, 0, 1)
+    print(f"set_capacity == full recompute on 20 seeded edit streams: {replay_ok}")
+
+    # NETWORK has a one-way road (JB->JA), so the tree needs the two-way view.
+    tree = GomoryHuTree.build(NETWORK, symmetrize=True)
+    pairs = [(a, b) for a in NETWORK for b in NETWORK if a < b]
+    print("Gomory-Hu all-pairs max flow, roads as two-way (max of both directions): " + ", ".join(
+        f"{a}-{b}={tree.max_flow(a, b)}" for a, b in pairs))